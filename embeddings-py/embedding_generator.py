@@ -5,6 +5,7 @@ Generates embeddings and UMAP coordinates, tests file sizes
 Uses NLTK Brown Corpus for frequency-based word selection
 """
 
+import os
 import json
 import numpy as np
 import pickle
@@ -12,10 +13,13 @@ import gzip
 import brotli
 import struct
 import base64
+import heapq
+import hashlib
+import importlib.util
 from pathlib import Path
+import torch
 from sentence_transformers import SentenceTransformer
 import umap
-from sklearn.metrics.pairwise import cosine_similarity
 import time
 from collections import Counter
 
@@ -36,6 +40,35 @@ try:
 except ImportError:
     HAS_LZ4 = False
 
+try:
+    from cuml import UMAP as cuUMAP
+    HAS_CUML = True
+except ImportError:
+    HAS_CUML = False
+
+try:
+    import polars as pl
+    HAS_POLARS = True
+except ImportError:
+    HAS_POLARS = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import simsimd
+    HAS_SIMSIMD = True
+except ImportError:
+    HAS_SIMSIMD = False
+
+# Only the presence of the ONNX backend matters; sentence-transformers imports it itself
+HAS_ONNX = (importlib.util.find_spec('onnxruntime') is not None and
+            importlib.util.find_spec('optimum') is not None and
+            importlib.util.find_spec('optimum.onnxruntime') is not None)
+
 def get_frequency_sorted_words(n_words=100):
     """Get words sorted by actual usage frequency from Brown Corpus"""
 
@@ -51,22 +84,20 @@ def get_frequency_sorted_words(n_words=100):
 
     # Get word frequencies from Brown corpus (1M+ words of real text)
     print("📊 Analyzing word frequencies from Brown corpus...")
-    brown_words = [word.lower() for word in brown.words() if word.isalpha()]
-    word_freq = Counter(brown_words)
+    word_freq = Counter(word.lower() for word in brown.words() if word.isalpha())
 
-    print(f"📖 Brown corpus contains {len(brown_words)} total words")
+    print(f"📖 Brown corpus contains {sum(word_freq.values())} total words")
     print(f"📋 Unique vocabulary: {len(word_freq)} words")
 
     # Get valid English words from NLTK dictionary
-    valid_words = set(w.lower() for w in nltk_words.words() if w.isalpha())
+    valid_words = frozenset(w.lower() for w in nltk_words.words() if w.isalpha())
     print(f"📚 NLTK dictionary contains {len(valid_words)} valid words")
 
     # Filter frequent words that are also valid English words
     print("🔍 Filtering for game-appropriate words...")
-    frequent_valid_words = []
 
     # Remove overly common function words that aren't interesting for games
-    stop_words = {
+    stop_words = frozenset({
         'the', 'be', 'to', 'of', 'and', 'a', 'in', 'that', 'have', 'i', 'it', 'for',
         'not', 'on', 'with', 'he', 'as', 'you', 'do', 'at', 'this', 'but', 'his', 'by',
         'from', 'they', 'we', 'say', 'her', 'she', 'or', 'an', 'will', 'my', 'one', 'all',
@@ -75,21 +106,35 @@ def get_frequency_sorted_words(n_words=100):
         'them', 'these', 'very', 'just', 'into',
         'over', 'also', 'your', 'only', 'still', 'never',
         'each', 'how', 'our', 'out', 'most', 'some', 'her'
-    }
-
-    for word, frequency in word_freq.most_common():
-        if (word in valid_words and
-                word not in stop_words and
-                3 <= len(word) <= 12 and
-                word.isalpha() and
-                frequency >= 3):  # Must appear at least 3 times
-            frequent_valid_words.append((word, frequency))
+    })
+
+    if HAS_POLARS:
+        # Columnar filter: the predicates run as vectorized masks instead of a per-token Python loop.
+        # filter keeps corpus order and maintain_order keeps ties in it, matching the heapq path.
+        frequent_valid_words = list(
+            pl.DataFrame({'word': list(word_freq.keys()), 'frequency': list(word_freq.values())})
+            .filter((pl.col('frequency') >= 3) &  # Must appear at least 3 times
+                    pl.col('word').str.len_chars().is_between(3, 12) &
+                    pl.col('word').is_in(pl.Series(list(valid_words), dtype=pl.String)) &
+                    ~pl.col('word').is_in(pl.Series(list(stop_words), dtype=pl.String)))
+            .sort('frequency', descending=True, maintain_order=True)
+            .head(n_words)
+            .iter_rows()
+        )
+    else:
+        # Filter before ranking so only the top n_words candidates are ever sorted
+        candidates = ((word, frequency) for word, frequency in word_freq.items()
+                      if (frequency >= 3 and  # Must appear at least 3 times
+                          3 <= len(word) <= 12 and
+                          word in valid_words and
+                          word not in stop_words))
+        frequent_valid_words = heapq.nlargest(n_words, candidates, key=lambda x: x[1])
 
     # Extract just the words (already sorted by frequency)
-    words_only = [word for word, freq in frequent_valid_words[:n_words]]
+    words_only = [word for word, freq in frequent_valid_words]
 
     print(f"✅ Selected {len(words_only)} most frequent words")
-    print(f"📈 Frequency range: {frequent_valid_words[0][1]} to {frequent_valid_words[min(len(frequent_valid_words)-1, n_words-1)][1]} occurrences")
+    print(f"📈 Frequency range: {frequent_valid_words[0][1]} to {frequent_valid_words[-1][1]} occurrences")
     print(f"🔥 Most frequent: {words_only[:15]}")
     print(f"❄️  Sample mid-range: {words_only[len(words_only)//2:len(words_only)//2+10]}")
 
@@ -103,25 +148,84 @@ def format_size(size_bytes):
         size_bytes /= 1024.0
     return f"{size_bytes:.2f} TB"
 
+def _orjson_default(obj):
+    """Turn ndarray subclasses such as memmaps into plain arrays orjson encodes natively"""
+    if isinstance(obj, np.ndarray):
+        return np.asarray(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps_json(data):
+    """Serialize to UTF-8 JSON bytes, encoding NumPy arrays natively when orjson is available"""
+    if HAS_ORJSON:
+        return orjson.dumps(data, default=_orjson_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(data, default=lambda arr: arr.tolist()).encode('utf-8')
+
+# Binary container header: magic, n_words, emb_dim, coord_dim, emb_bits, coord_bits,
+# emb_min, emb_max, coord_min, coord_max, byte length of the words blob (unpadded)
+CONTAINER_MAGIC = b'SMQ1'
+CONTAINER_HEADER = struct.Struct('<4sIHHBB2x4fI')
+# Every data block starts at a multiple of this, so typed-array views can be built in place
+CONTAINER_ALIGN = 8
+
+def pack_binary_container(words, embeddings, coords, emb_bits, coord_bits=8,
+                          emb_min=0.0, emb_max=0.0, coord_min=0.0, coord_max=0.0, emb_dim=None):
+    """Pack embeddings and coordinates into a compact binary container
+
+    Layout (little-endian): CONTAINER_HEADER, newline-separated UTF-8 words,
+    embedding payload, then coordinate payload. A block with 8 bits holds uint8,
+    32 bits holds float32 and 1 bit (embeddings only) holds packed sign bits.
+    The words blob and embedding payload are zero-padded to a multiple of
+    CONTAINER_ALIGN bytes, so each block is a raw view the client can slice
+    directly. emb_dim is the real embedding dimension; it must be given for
+    1-bit blocks, whose rows are padded to whole bytes.
+    """
+    n_words, coord_dim = coords.shape
+    if emb_dim is None:
+        emb_dim = embeddings.shape[1]
+    words_blob = '\n'.join(words).encode('utf-8')
+    embeddings = np.ascontiguousarray(embeddings)
+    coords = np.ascontiguousarray(coords)
+
+    def padding(offset):
+        return bytes(-offset % CONTAINER_ALIGN)
+
+    header = CONTAINER_HEADER.pack(CONTAINER_MAGIC, n_words, emb_dim, coord_dim, emb_bits, coord_bits,
+                                   emb_min, emb_max, coord_min, coord_max, len(words_blob))
+    # Join buffer views so the arrays are copied exactly once, into the final payload
+    return b''.join([header, words_blob, padding(CONTAINER_HEADER.size + len(words_blob)),
+                     embeddings.data, padding(embeddings.nbytes), coords.data])
+
 def analyze_collisions(embeddings, words, bits=8):
     """Analyze collision rates for quantized embeddings"""
     def quantize_to_uint(arr, n_bits):
-        arr_min, arr_max = arr.min(), arr.max()
-        scale = (2**n_bits - 1) / (arr_max - arr_min)
-        quantized = ((arr - arr_min) * scale).astype(getattr(np, f'uint{n_bits}' if n_bits <= 8 else 'uint16'))
+        # Per-dimension range, so one outlier dim can't squash every other dim into a few codes
+        arr_min, arr_max = arr.min(axis=0), arr.max(axis=0)
+        span = arr_max - arr_min
+        span[span == 0] = 1
+        scale = (2**n_bits - 1) / span
+        # Shift and scale in one reused float32 buffer before the integer cast
+        scratch = np.subtract(arr, arr_min, dtype=np.float32)
+        np.multiply(scratch, scale, out=scratch)
+        quantized = scratch.astype(getattr(np, f'uint{n_bits}' if n_bits <= 8 else 'uint16'))
         return quantized
 
     print(f"\n🔍 COLLISION ANALYSIS ({bits}-bit quantization):")
     print("=" * 50)
 
     # Quantize embeddings
-    quantized = quantize_to_uint(embeddings, bits)
+    quantized = np.ascontiguousarray(quantize_to_uint(embeddings, bits))
 
-    # Convert to tuples for hashing (to find duplicates)
-    embedding_tuples = [tuple(row) for row in quantized]
+    # View each row as a single fixed-size record so duplicates are found in C
+    rows = quantized.view([('', quantized.dtype)] * quantized.shape[1]).ravel()
+
+    # Sorting the rows once lays out every group of identical rows as a contiguous run
+    order = np.argsort(rows, kind='stable')
+    sorted_rows = rows[order]
+    run_starts = np.concatenate(([0], np.flatnonzero(sorted_rows[1:] != sorted_rows[:-1]) + 1))
+    counts = np.diff(np.append(run_starts, rows.size))
 
     # Count unique embeddings
-    unique_embeddings = len(set(embedding_tuples))
+    unique_embeddings = run_starts.size
     total_embeddings = len(embeddings)
     collision_rate = (total_embeddings - unique_embeddings) / total_embeddings
 
@@ -131,63 +235,78 @@ def analyze_collisions(embeddings, words, bits=8):
     print(f"Words sharing embeddings: {total_embeddings - unique_embeddings}")
 
     # Find actual colliding words
-    embedding_counts = Counter(embedding_tuples)
-    collisions = {emb: count for emb, count in embedding_counts.items() if count > 1}
+    collision_mask = counts > 1
+    n_collisions = int(collision_mask.sum())
 
-    if collisions:
+    if n_collisions:
         print(f"\n📋 COLLISION DETAILS:")
+        group_starts = run_starts[collision_mask]
+        group_counts = counts[collision_mask]
+
+        # List groups in order of first occurrence, as they appear in the word list
+        by_first_word = np.argsort(order[group_starts], kind='stable')
         collision_groups = []
-        for embedding_tuple, count in list(collisions.items())[:5]:  # Show first 5 collision groups
-            # Find words with this embedding
-            colliding_words = []
-            for i, emb_tuple in enumerate(embedding_tuples):
-                if emb_tuple == embedding_tuple:
-                    colliding_words.append(words[i])
+        for start, count in zip(group_starts[by_first_word[:5]], group_counts[by_first_word[:5]]):  # Show first 5 collision groups
+            colliding_words = [words[i] for i in order[start:start + count].tolist()]
             collision_groups.append(colliding_words)
             print(f"  {count} words share embedding: {colliding_words}")
 
-        if len(collisions) > 5:
-            print(f"  ... and {len(collisions) - 5} more collision groups")
+        if n_collisions > 5:
+            print(f"  ... and {n_collisions - 5} more collision groups")
 
         return collision_rate, collision_groups
     else:
         print("✅ No collisions found!")
         return 0.0, []
 
-def analyze_similarity_collisions(embeddings, words, target_word=None, bits=8):
-    """Analyze how many words would have same similarity score to a target"""
-    if target_word is None or target_word not in words:
+def analyze_similarity_collisions(embeddings, words, target_word=None, bits=8, word_to_idx=None):
+    """Analyze how many words would have same similarity score to a target
+
+    Expects L2-normalized embeddings, so cosine similarity is a plain dot product.
+    """
+    if word_to_idx is None:
+        word_to_idx = {w: i for i, w in enumerate(words)}
+
+    if target_word is None or target_word not in word_to_idx:
         # Use a common word as target for demo
         common_targets = ['house', 'water', 'time', 'person', 'day']
-        target_word = next((w for w in common_targets if w in words), words[len(words) // 2])
+        target_word = next((w for w in common_targets if w in word_to_idx), words[len(words) // 2])
         print(f"Using '{target_word}' as example target word")
 
-    target_idx = words.index(target_word)
+    target_idx = word_to_idx[target_word]
     target_embedding = embeddings[target_idx]
 
-    # Calculate similarities to target
-    similarities = cosine_similarity([target_embedding], embeddings)[0]
+    # Calculate similarities to target (SIMD kernels if available, else one BLAS matrix-vector product)
+    if HAS_SIMSIMD:
+        similarities = 1 - np.asarray(simsimd.cdist(target_embedding[None], embeddings, metric='cosine'))[0]
+    else:
+        similarities = embeddings @ target_embedding
 
-    # Quantize similarities
-    sim_min, sim_max = similarities.min(), similarities.max()
+    # Quantize similarities over the fixed cosine range, so the scale is identical for every target
+    sim_min, sim_max = -1.0, 1.0
     scale = (2**bits - 1) / (sim_max - sim_min)
-    quantized_sims = ((similarities - sim_min) * scale).astype(np.uint8)
+    quantized_sims = np.clip((similarities - sim_min) * scale, 0, 2**bits - 1).astype(np.uint8)
 
-    # Count similarity collisions
-    sim_counts = Counter(quantized_sims)
-    sim_collisions = {sim: count for sim, count in sim_counts.items() if count > 1}
+    # Count similarity collisions (one histogram pass over the 2**bits buckets)
+    sim_counts = np.bincount(quantized_sims, minlength=2**bits)
+    collision_mask = sim_counts > 1
+    collision_buckets = np.flatnonzero(collision_mask)
 
     print(f"\n🎯 SIMILARITY COLLISION ANALYSIS (target: '{target_word}'):")
     print("=" * 55)
-    print(f"Unique similarity scores: {len(sim_counts)}")
-    print(f"Words sharing same similarity score: {len(sim_collisions)} groups")
+    print(f"Unique similarity scores: {np.count_nonzero(sim_counts)}")
+    print(f"Words sharing same similarity score: {collision_buckets.size} groups")
 
     # Show examples of words with same similarity scores
-    if sim_collisions:
+    if collision_buckets.size:
         print(f"\n📊 EXAMPLES OF WORDS WITH SAME SIMILARITY SCORE:")
-        for quantized_sim, count in list(sim_collisions.items())[:3]:  # Show top 3
+        # One stable sort groups word indices by bucket, in word-list order within each bucket
+        order = np.argsort(quantized_sims, kind='stable')
+        buckets = np.split(order, np.cumsum(sim_counts)[:-1])
+        for quantized_sim in collision_buckets[::-1][:3]:  # Show top 3 (highest similarity first)
+            count = int(sim_counts[quantized_sim])
             # Find words with this similarity score
-            word_indices = np.where(quantized_sims == quantized_sim)[0]
+            word_indices = buckets[quantized_sim]
             example_words = [words[i] for i in word_indices[:5]]  # Show up to 5 words
             actual_sim = (quantized_sim / scale) + sim_min
 
@@ -195,39 +314,80 @@ def analyze_similarity_collisions(embeddings, words, target_word=None, bits=8):
             if count > 5:
                 print(f"    ... and {count - 5} more words")
 
-    total_collision_rate = sum(count - 1 for count in sim_collisions.values()) / len(words)
+    total_collision_rate = int((sim_counts[collision_mask] - 1).sum()) / len(words)
     return total_collision_rate
 
 class EmbeddingGenerator:
-    def __init__(self, model_name='all-MiniLM-L6-v2'):
-        print(f"🤖 Loading model: {model_name}")
-        self.model = SentenceTransformer(model_name)
+    def __init__(self, model_name='all-MiniLM-L6-v2', cache_dir='.cache'):
+        # ONNX Runtime fuses operators into SIMD kernels, much faster than torch on CPU;
+        # on a GPU host torch stays in charge so encoding runs on CUDA
+        self.backend = 'onnx' if HAS_ONNX and not torch.cuda.is_available() else 'torch'
+        print(f"🤖 Loading model: {model_name} ({self.backend} backend)")
+        self.model = SentenceTransformer(model_name, backend=self.backend)
+        if self.backend == 'torch' and self.model.device.type == 'cpu':
+            # Let the CPU encoder use every core
+            torch.set_num_threads(os.cpu_count() or 1)
+        # Encode in fp16 where the hardware has fast half-precision kernels (CPU fp16 matmuls are slower)
+        self.precision = 'float16' if self.backend == 'torch' and self.model.device.type == 'cuda' else 'float32'
+        if self.precision == 'float16':
+            self.model.half()
+        self.model_name = model_name
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(exist_ok=True)
         self.embeddings = None
+        self._emb_norm = None
         self.words = None
+        self._word_to_idx = None
         self.umap_coords = None
 
-    def generate_embeddings(self, words):
-        """Generate embeddings for a list of words"""
+    def generate_embeddings(self, words, batch_size=256):
+        """Generate L2-normalized embeddings for a list of words"""
         print(f"\n🧠 Generating embeddings for {len(words)} words...")
         start_time = time.time()
 
         self.words = words
-        self.embeddings = self.model.encode(words, show_progress_bar=True)
+        self._word_to_idx = {w: i for i, w in enumerate(words)}
+
+        # Re-encoding is the slowest step, so reuse earlier output for the same model and word list
+        cache_key = hashlib.sha256('\n'.join([self.model_name, self.backend, self.precision, *words]).encode('utf-8')).hexdigest()
+        cache_path = self.cache_dir / f"embeddings_{cache_key}.npy"
+        if cache_path.exists():
+            print(f"💾 Loading cached embeddings from {cache_path}")
+        else:
+            encoded = self.model.encode(words, batch_size=batch_size, convert_to_numpy=True,
+                                        normalize_embeddings=True, show_progress_bar=True)
+            # Fill a temporary file and rename it into place, so an interrupted run never leaves a
+            # complete-looking cache entry full of zeros behind
+            tmp_path = cache_path.with_name(f"{cache_path.stem}.{os.getpid()}.tmp.npy")
+            cache_file = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=encoded.dtype, shape=encoded.shape)
+            cache_file[:] = encoded
+            cache_file.flush()
+            del cache_file, encoded
+            os.replace(tmp_path, cache_path)
+        # Work directly on the contiguous, 64-byte aligned .npy mapping; exports hand out views of it.
+        # Copy-on-write keeps the array writable for downstream libraries without touching the cache.
+        self.embeddings = np.load(cache_path, mmap_mode='c')
+        # Already unit length, so cosine similarity is a plain dot product (kept in float32 for BLAS)
+        self._emb_norm = self.embeddings.astype(np.float32, copy=False)
 
         elapsed = time.time() - start_time
         print(f"✅ Generated embeddings in {elapsed:.2f} seconds")
         print(f"📊 Embedding shape: {self.embeddings.shape}")
         return self.embeddings
 
-    def generate_umap_coordinates(self, n_components=2, random_state=42):
-        """Generate UMAP 2D coordinates from embeddings"""
+    def generate_umap_coordinates(self, n_components=2, random_state=None):
+        """Generate UMAP 2D coordinates from embeddings
+
+        Fixing random_state makes the layout reproducible but forces UMAP to run
+        single-threaded, so it is left unset by default.
+        """
         if self.embeddings is None:
             raise ValueError("Must generate embeddings first")
 
         print(f"\n🗺️  Generating UMAP coordinates...")
         start_time = time.time()
 
-        reducer = umap.UMAP(
+        params = dict(
             n_components=n_components,
             random_state=random_state,
             n_neighbors=15,
@@ -235,7 +395,25 @@ class EmbeddingGenerator:
             metric='cosine'
         )
 
-        self.umap_coords = reducer.fit_transform(self.embeddings)
+        cache_hash = hashlib.sha256(memoryview(self.embeddings))
+        cache_hash.update(repr(sorted(params.items())).encode('utf-8'))
+        cache_path = self.cache_dir / f"umap_{cache_hash.hexdigest()}.npy"
+        if cache_path.exists():
+            print(f"💾 Loading cached UMAP coordinates from {cache_path}")
+            self.umap_coords = np.load(cache_path)
+        else:
+            if HAS_CUML:
+                # GPU UMAP; returns coordinates in the input's (NumPy) format
+                reducer = cuUMAP(**params)
+            else:
+                reducer = umap.UMAP(**params, low_memory=False, n_jobs=-1)
+            self.umap_coords = reducer.fit_transform(self.embeddings)
+            # Write under a temporary name and rename, so a partial file is never taken as a cache hit
+            tmp_path = cache_path.with_name(f"{cache_path.stem}.{os.getpid()}.tmp.npy")
+            with open(tmp_path, 'wb') as f:
+                np.save(f, self.umap_coords)
+                f.flush()
+            os.replace(tmp_path, cache_path)
 
         elapsed = time.time() - start_time
         print(f"✅ Generated UMAP coordinates in {elapsed:.2f} seconds")
@@ -244,14 +422,13 @@ class EmbeddingGenerator:
 
     def test_similarity(self, word1, word2):
         """Test similarity between two words"""
-        if word1 not in self.words or word2 not in self.words:
+        if word1 not in self._word_to_idx or word2 not in self._word_to_idx:
             return None
 
-        idx1 = self.words.index(word1)
-        idx2 = self.words.index(word2)
+        idx1 = self._word_to_idx[word1]
+        idx2 = self._word_to_idx[word2]
 
-        sim = cosine_similarity([self.embeddings[idx1]], [self.embeddings[idx2]])[0][0]
-        return float(sim)
+        return float(self._emb_norm[idx1] @ self._emb_norm[idx2])
 
 
     def export_data(self, output_dir="output"):
@@ -263,15 +440,20 @@ class EmbeddingGenerator:
         print("📦 EXPORTING DATA AND TESTING SIZES")
         print("="*50)
 
-        # Prepare data
+        # Cast the float32 arrays once and share a zero-copy view of the bytes with every binary format below
+        embeddings_f32 = self.embeddings.astype(np.float32, copy=False)
+        coords_f32 = self.umap_coords.astype(np.float32, copy=False)
+        embeddings_bytes = memoryview(np.ascontiguousarray(embeddings_f32)).cast('B')
+
+        # Prepare data (always float32, whatever precision the model encoded in)
         data = {
             "words": self.words,
-            "embeddings": self.embeddings.tolist(),
-            "umap_coordinates": self.umap_coords.tolist(),
+            "embeddings": embeddings_f32,
+            "umap_coordinates": coords_f32,
             "metadata": {
                 "n_words": len(self.words),
                 "embedding_dim": self.embeddings.shape[1],
-                "model_name": "all-MiniLM-L6-v2",
+                "model_name": self.model_name,
                 "generated_at": time.time(),
                 "source": "NLTK Brown Corpus (frequency-sorted)"
             }
@@ -280,23 +462,25 @@ class EmbeddingGenerator:
         formats = {}
 
         # === JSON FORMATS ===
+        # Serialize once; the raw, gzip and brotli variants all share these bytes
+        json_payload = dumps_json(data)
+
         # 1. JSON (raw)
         json_file = output_path / "embeddings.json"
-        with open(json_file, 'w') as f:
-            json.dump(data, f)
+        with open(json_file, 'wb') as f:
+            f.write(json_payload)
         formats['JSON (raw)'] = json_file.stat().st_size
 
         # 2. JSON (gzip)
         json_gz_file = output_path / "embeddings.json.gz"
-        with gzip.open(json_gz_file, 'wt') as f:
-            json.dump(data, f)
+        with gzip.open(json_gz_file, 'wb') as f:
+            f.write(json_payload)
         formats['JSON (gzip)'] = json_gz_file.stat().st_size
 
         # 3. JSON (brotli)
         json_br_file = output_path / "embeddings.json.br"
-        json_str = json.dumps(data)
         with open(json_br_file, 'wb') as f:
-            f.write(brotli.compress(json_str.encode('utf-8')))
+            f.write(brotli.compress(json_payload))
         formats['JSON (brotli)'] = json_br_file.stat().st_size
 
         # === BINARY FORMATS ===
@@ -310,22 +494,20 @@ class EmbeddingGenerator:
 
         # 5. Float32 binary
         float32_file = output_path / "embeddings_float32.bin.gz"
-        embeddings_f32 = self.embeddings.astype(np.float32)
         with gzip.open(float32_file, 'wb') as f:
-            f.write(embeddings_f32.tobytes())
+            f.write(embeddings_bytes)
         formats['Float32 binary (gzip)'] = float32_file.stat().st_size
 
         # 6. Float16 binary (lossy)
         float16_file = output_path / "embeddings_float16.bin.gz"
-        embeddings_f16 = self.embeddings.astype(np.float16)
+        embeddings_f16 = self.embeddings.astype(np.float16, copy=False)
         with gzip.open(float16_file, 'wb') as f:
-            f.write(embeddings_f16.tobytes())
+            f.write(memoryview(np.ascontiguousarray(embeddings_f16)).cast('B'))
         formats['Float16 binary (gzip)'] = float16_file.stat().st_size
 
         # === SPECIALIZED COMPRESSION ===
         if HAS_BLOSC:
             blosc_file = output_path / "embeddings.blosc2"
-            embeddings_f32 = self.embeddings.astype(np.float32)
             compressed = blosc2.compress2(embeddings_f32)
             with open(blosc_file, 'wb') as f:
                 f.write(compressed)
@@ -333,8 +515,7 @@ class EmbeddingGenerator:
 
         if HAS_LZ4:
             lz4_file = output_path / "embeddings.lz4"
-            embeddings_f32 = self.embeddings.astype(np.float32)
-            compressed = lz4.frame.compress(embeddings_f32.tobytes())
+            compressed = lz4.frame.compress(embeddings_bytes)
             with open(lz4_file, 'wb') as f:
                 f.write(compressed)
             formats['LZ4 (float32)'] = lz4_file.stat().st_size
@@ -344,7 +525,10 @@ class EmbeddingGenerator:
         def quantize_to_uint8(arr):
             arr_min, arr_max = arr.min(), arr.max()
             scale = 255.0 / (arr_max - arr_min)
-            quantized = ((arr - arr_min) * scale).astype(np.uint8)
+            # Shift and scale in one reused float32 buffer before the uint8 cast
+            scratch = np.subtract(arr, arr_min, dtype=np.float32)
+            np.multiply(scratch, scale, out=scratch)
+            quantized = scratch.astype(np.uint8)
             return quantized, arr_min, arr_max, scale
 
         quant_embeddings, emb_min, emb_max, emb_scale = quantize_to_uint8(self.embeddings)
@@ -361,41 +545,43 @@ class EmbeddingGenerator:
         }
 
         # 8a. 8-bit quantized JSON (raw) - NEW!
+        quant_json_payload = dumps_json(quant_data)
         quant_json_file = output_path / "embeddings_quantized.json"
-        with open(quant_json_file, 'w') as f:
-            json.dump(quant_data, f)
+        with open(quant_json_file, 'wb') as f:
+            f.write(quant_json_payload)
         formats['8-bit quantized JSON (raw)'] = quant_json_file.stat().st_size
 
-        # 8b. 8-bit quantized + Brotli (existing)
-        quant_file = output_path / "embeddings_quantized.json.br"
+        # 8b. 8-bit quantized + Brotli (binary container: no JSON, no base64)
+        quant_file = output_path / "embeddings_q8.bin.br"
+        q8_payload = pack_binary_container(self.words, quant_embeddings, quant_coords, 8, 8,
+                                           emb_min, emb_max, coord_min, coord_max)
         with open(quant_file, 'wb') as f:
-            f.write(brotli.compress(json.dumps(quant_data).encode('utf-8')))
+            f.write(brotli.compress(q8_payload, quality=11))
         formats['8-bit quantized + Brotli'] = quant_file.stat().st_size
 
-        # 7. Base64 + Brotli (web-friendly)
-        b64_file = output_path / "embeddings_b64.json.br"
-        embeddings_f32 = self.embeddings.astype(np.float32)
-        coords_f32 = self.umap_coords.astype(np.float32)
-
-        web_data = {
-            "words": self.words,
-            "embeddings_b64": base64.b64encode(embeddings_f32.tobytes()).decode('ascii'),
-            "coordinates_b64": base64.b64encode(coords_f32.tobytes()).decode('ascii'),
-            "shape": self.embeddings.shape,
-            "coords_shape": self.umap_coords.shape,
-            "dtype": "float32"
-        }
-
-        with open(b64_file, 'wb') as f:
-            f.write(brotli.compress(json.dumps(web_data).encode('utf-8')))
-        formats['Base64 + Brotli (web)'] = b64_file.stat().st_size
+        # 8c. 1-bit (sign) binary container + Brotli
+        b1_bin_file = output_path / "embeddings_b1.bin.br"
+        embeddings_b1 = np.packbits(self.embeddings > 0, axis=1)
+        b1_payload = pack_binary_container(self.words, embeddings_b1, quant_coords, 1, 8,
+                                           coord_min=coord_min, coord_max=coord_max,
+                                           emb_dim=self.embeddings.shape[1])
+        with open(b1_bin_file, 'wb') as f:
+            f.write(brotli.compress(b1_payload, quality=11))
+        formats['1-bit binary + Brotli'] = b1_bin_file.stat().st_size
+
+        # 7. Float32 binary + Brotli (web-friendly)
+        web_file = output_path / "embeddings_f32.bin.br"
+        web_payload = pack_binary_container(self.words, embeddings_f32, coords_f32, 32, 32)
+        with open(web_file, 'wb') as f:
+            f.write(brotli.compress(web_payload))
+        formats['Float32 binary + Brotli (web)'] = web_file.stat().st_size
 
         # Print results
         self._print_results(formats)
 
         # NEW: Analyze collisions
         analyze_collisions(self.embeddings, self.words, bits=8)
-        analyze_similarity_collisions(self.embeddings, self.words, bits=8)
+        analyze_similarity_collisions(self._emb_norm, self.words, bits=8, word_to_idx=self._word_to_idx)
 
         return formats
 
@@ -415,7 +601,7 @@ class EmbeddingGenerator:
 
         print(f"\n💡 BEST FOR WEB GAME:")
         print(f"🥇 Smallest: {sorted_formats[0][0]} - {format_size(sorted_formats[0][1])}")
-        print(f"🥈 Good balance: Base64 + Brotli (web)")
+        print(f"🥈 Good balance: Float32 binary + Brotli (web)")
 
         if not HAS_BLOSC:
             print("\n⚠️  For even better compression: pip install blosc2 lz4")
@@ -445,8 +631,8 @@ def main():
         test_pairs = [("house", "home"), ("person", "man"), ("time", "day"), ("water", "sea")]
         print(f"\n🔍 Sample similarities:")
         for word1, word2 in test_pairs:
-            if word1 in words and word2 in words:
-                sim = generator.test_similarity(word1, word2)
+            sim = generator.test_similarity(word1, word2)
+            if sim is not None:
                 print(f"  {word1} ↔ {word2}: {sim:.3f}")
 
         # Export data